@@ -2,22 +2,139 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.const import Platform
+from aiohttp import ClientSession, TCPConnector
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
 from homeassistant.helpers.storage import Store
 
+from .api import UfanetApiClient
 from .const import CONF_CONTRACT, DOMAIN
+from .data import UfanetRuntimeData
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import Event, HomeAssistant
 
 STORAGE_KEY = f"{DOMAIN}_credentials"
 STORAGE_VERSION = 1
 
 PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.CAMERA]
 
+SESSION_KEY = "_session"
+SESSION_USERS_KEY = "_session_users"
+SESSION_UNSUB_KEY = "_session_unsub"
+STORE_KEY = "_store"
+STORED_DATA_KEY = "_stored_data"
+
+# Seconds to batch token updates before writing the credentials file
+TOKEN_SAVE_DELAY = 1.0
+
+
+def async_get_store(hass: HomeAssistant) -> Store:
+    """
+    Return the credentials store shared by all entries.
+
+    A single Store instance lets concurrent entry setups share one in-flight
+    load instead of each parsing the file separately.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store: Store | None = domain_data.get(STORE_KEY)
+    if store is None:
+        store = domain_data[STORE_KEY] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    return store
+
+
+async def async_load_stored_data(hass: HomeAssistant) -> dict[str, Any]:
+    """
+    Return the stored credentials of all contracts, loaded once per run.
+
+    Every writer mutates this dict and saves it back through the shared store,
+    so token updates never need to re-read the file first.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    stored_data: dict[str, Any] | None = domain_data.get(STORED_DATA_KEY)
+    if stored_data is None:
+        loaded = await async_get_store(hass).async_load() or {}
+        # Keep the first result if several entries loaded concurrently
+        stored_data = domain_data.setdefault(STORED_DATA_KEY, loaded)
+    return stored_data
+
+
+class TokenStore:
+    """Persist token updates of one contract through the shared store."""
+
+    def __init__(
+        self, store: Store, stored_data: dict[str, Any], contract: str
+    ) -> None:
+        """Initialize with the shared store and its loaded data."""
+        self._store = store
+        self._stored_data = stored_data
+        self._contract = contract
+
+    async def async_save_token(self, token: str, exp: int) -> None:
+        """Remember a new refresh token and schedule a debounced write."""
+        self._stored_data.setdefault(self._contract, {}).update(
+            refresh_token=token, refresh_exp=exp
+        )
+        # Bursts of updates (several entries, reauth) collapse into one write;
+        # Store flushes pending writes when Home Assistant stops
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the credentials of all contracts for the delayed write."""
+        return self._stored_data
+
+
+async def async_get_token_store(hass: HomeAssistant, contract: str) -> TokenStore:
+    """Return a token store for a contract, backed by the shared credentials."""
+    return TokenStore(
+        async_get_store(hass), await async_load_stored_data(hass), contract
+    )
+
+
+def _async_acquire_session(hass: HomeAssistant) -> ClientSession:
+    """Return the integration-wide HTTP session, creating it on first use."""
+    domain_data = hass.data[DOMAIN]
+    session: ClientSession | None = domain_data.get(SESSION_KEY)
+    if session is None or session.closed:
+        # Keep-alive pool shared by all entries so dom.ufanet.ru connections
+        # (TCP + TLS) are reused across calls
+        session = ClientSession(
+            connector=TCPConnector(
+                limit=20,
+                limit_per_host=8,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            )
+        )
+        domain_data[SESSION_KEY] = session
+        domain_data[SESSION_USERS_KEY] = 0
+
+        async def _close_session(_event: Event) -> None:
+            # The listener is gone once it fires; do not unsubscribe it later
+            if domain_data.get(SESSION_KEY) is session:
+                domain_data.pop(SESSION_UNSUB_KEY, None)
+            await session.close()
+
+        domain_data[SESSION_UNSUB_KEY] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _close_session
+        )
+
+    domain_data[SESSION_USERS_KEY] += 1
+    return session
+
+
+async def _async_release_session(hass: HomeAssistant) -> None:
+    """Drop one reference to the shared session and close it when unused."""
+    domain_data = hass.data[DOMAIN]
+    domain_data[SESSION_USERS_KEY] -= 1
+    if domain_data[SESSION_USERS_KEY] <= 0:
+        session: ClientSession = domain_data.pop(SESSION_KEY)
+        if unsub := domain_data.pop(SESSION_UNSUB_KEY, None):
+            unsub()
+        await session.close()
+
 
 async def async_setup(_hass: HomeAssistant, _config: dict) -> bool:
     """Set up the integration from yaml (not supported)."""
@@ -30,8 +147,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Load credentials from secure storage (keyed by contract)
     contract = entry.data.get(CONF_CONTRACT)
-    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-    stored_data = await store.async_load() or {}
+    store = async_get_store(hass)
+    stored_data = await async_load_stored_data(hass)
     credentials = stored_data.get(contract, {})
 
     # Migration: remove stored password if present (no longer persisted)
@@ -40,23 +157,40 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         stored_data[contract] = credentials
         await store.async_save(stored_data)
 
-    # Prepare data for platforms (credentials from secure storage, rest from entry.data)
-    platform_data = dict(entry.data)
-    # Add credentials from secure storage
-    platform_data["refresh_token"] = credentials.get("refresh_token")
-    platform_data["refresh_exp"] = credentials.get("refresh_exp")
-    platform_data["_store"] = store
-    platform_data["_contract"] = contract
-
-    hass.data[DOMAIN][entry.entry_id] = platform_data
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # One client per entry, shared by all platforms, so buttons and cameras
+    # reuse the same access token and always see the latest refresh token
+    session = _async_acquire_session(hass)
+    client = UfanetApiClient(
+        session,
+        contract,
+        refresh_token=credentials.get("refresh_token"),
+        refresh_exp=credentials.get("refresh_exp"),
+        on_token_update=TokenStore(store, stored_data, contract).async_save_token,
+    )
+
+    # Credentials from secure storage, the rest from entry.data
+    hass.data[DOMAIN][entry.entry_id] = UfanetRuntimeData(
+        contract=contract,
+        intercoms=entry.data.get("intercoms", []),
+        client=client,
+        session=session,
+    )
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except BaseException:
+        # Setup did not complete, so unload will not run to drop the reference
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await _async_release_session(hass)
+        raise
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    # Keep the session while platforms that failed to unload still use it
+    if unload_ok and hass.data[DOMAIN].pop(entry.entry_id, None) is not None:
+        await _async_release_session(hass)
     return unload_ok
 
 
@@ -64,7 +198,6 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry - clean up secure storage."""
     contract = entry.data.get(CONF_CONTRACT)
     if contract:
-        store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-        stored_data = await store.async_load() or {}
+        stored_data = await async_load_stored_data(hass)
         stored_data.pop(contract, None)
-        await store.async_save(stored_data)
+        await async_get_store(hass).async_save(stored_data)
@@ -2,35 +2,79 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import binascii
+import functools
 import json
+import random
+import re
 import time
-from collections.abc import Callable
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
-from urllib.parse import urljoin
+from typing import TYPE_CHECKING, ClassVar
+from urllib.parse import urljoin, urlsplit
 
-import async_timeout
-from aiohttp import ClientResponseError, ClientSession
+from aiohttp import (
+    ClientConnectorError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+)
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    from json import loads as _json_loads
 
 if TYPE_CHECKING:
     from typing import Any
 
 BASE_URL = "https://dom.ufanet.ru/"
 
+# Fixed endpoints, resolved once against BASE_URL
+_URL_SHARED = urljoin(BASE_URL, "api/v0/skud/shared/")
+_URL_CCTV = urljoin(BASE_URL, "api/v1/cctv")
+_URL_LOGIN = urljoin(BASE_URL, "api/v1/auth/auth_by_contract/")
+_URL_REFRESH = urljoin(BASE_URL, "api/v1/auth/refresh/")
+
 # HTTP status codes
 HTTP_STATUS_OK = 200
 HTTP_STATUS_BAD_REQUEST = 400
 HTTP_STATUS_UNAUTHORIZED = 401
+HTTP_STATUS_SERVER_ERROR = 500
 
 # JWT token parts count
 JWT_PARTS_COUNT = 3
+_JWT_EXP_RE = re.compile(rb'"exp"\s*:\s*(\d+)')
 
 # Token expiration skew in seconds
 TOKEN_EXPIRATION_SKEW = 60
 
+# Max seconds a confirmed-valid access token is trusted without re-checking
+TOKEN_CHECK_INTERVAL = 30
+
+# Seconds allowed to obtain a connection (fail fast on DNS/connect problems)
+CONNECT_TIMEOUT = 5
+
+# Max in-flight requests per client (per contract)
+MAX_CONCURRENT_REQUESTS = 4
+
+# Retry policy for transient failures (attempts include the first request);
+# all attempts of a request share its timeout as one deadline
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_CAP = 4.0
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Circuit breaker: consecutive failures before failing fast, and seconds to
+# wait before letting a probe request through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30
+
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable
+
+    TokenUpdateCallback = Callable[[str, int], Awaitable[None]]
 
 
 class UfanetApiError(Exception):
@@ -41,7 +85,7 @@ class UfanetApiAuthError(UfanetApiError):
     """Authentication/authorization error."""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IntercomInfo:
     """Intercom info subset used by the integration."""
 
@@ -52,7 +96,7 @@ class IntercomInfo:
     address: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CameraInfo:
     """Camera info needed for streaming."""
 
@@ -62,12 +106,88 @@ class CameraInfo:
     domain: str
     token_l: str
     screenshot_domain: str | None = None
+    # Expiration of token_l, decoded once when the camera list is parsed
+    token_exp: int | None = None
+
+
+@functools.lru_cache(maxsize=256)
+def parse_jwt_exp(token: str | None) -> int | None:
+    """Extract exp from a JWT without verification (cached per token)."""
+    if not token:
+        return None
+    try:
+        parts = token.split(".")
+        if len(parts) != JWT_PARTS_COUNT:
+            return None
+        payload_b64 = parts[1] + "=" * (-len(parts[1]) % 4)
+        raw = base64.urlsafe_b64decode(payload_b64.encode())
+        # Claims are flat JSON: scan for the integer exp before parsing it all
+        if match := _JWT_EXP_RE.search(raw):
+            return int(match.group(1))
+        payload = _json_loads(raw)
+        return int(payload.get("exp")) if "exp" in payload else None
+    except (binascii.Error, ValueError):
+        # Malformed base64, JSON (JSONDecodeError) or non-integer exp
+        return None
+
+
+def _parse_camera(item: dict[str, Any]) -> CameraInfo | None:
+    """Build CameraInfo from a cctv item, or None if it cannot be streamed."""
+    servers = item.get("servers") or {}
+    domain = servers.get("domain")
+    number = item.get("number")
+    token_l = item.get("token_l")
+    if not (domain and number and token_l):
+        return None
+    return CameraInfo(
+        number=number,
+        title=item.get("title"),
+        address=item.get("address"),
+        domain=domain,
+        token_l=token_l,
+        screenshot_domain=servers.get("screenshot_domain"),
+        token_exp=parse_jwt_exp(token_l),
+    )
+
+
+class _CircuitBreaker:
+    """Fail fast after repeated upstream failures, probing again after a pause."""
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < BREAKER_RESET_SECONDS:
+            return False
+        # Half-open: let this request probe, hold others back for another window
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a response from a healthy upstream."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure and open the breaker once the threshold is reached."""
+        self._failures += 1
+        if self._failures >= BREAKER_FAILURE_THRESHOLD:
+            self._opened_at = time.monotonic()
 
 
 class UfanetApiClient:
     """HTTP client for Ufanet intercom."""
 
-    def __init__(
+    # Shared by all clients so every entry sees the same upstream health
+    _breakers: ClassVar[dict[str, _CircuitBreaker]] = {}
+
+    def __init__(  # noqa: PLR0913
         self,
         session: ClientSession,
         contract: str,
@@ -75,6 +195,7 @@ class UfanetApiClient:
         password: str | None = None,
         refresh_token: str | None = None,
         refresh_exp: int | None = None,
+        on_token_update: TokenUpdateCallback | None = None,
     ) -> None:
         """
         Initialize the API client.
@@ -85,26 +206,39 @@ class UfanetApiClient:
             password: Optional password for authentication
             refresh_token: Optional refresh token
             refresh_exp: Optional refresh token expiration timestamp
+            on_token_update: Optional coroutine called with the new refresh
+                token and its expiration whenever they change
 
         """
         self._session = session
         self._contract = contract
         self._password = password
         self._access_token: str | None = None
+        self._auth_header = ""
         self._access_exp: int | None = None
+        self._access_trip_wall: float = 0.0
+        self._next_check_mono: float = 0.0
         self._refresh_token: str | None = refresh_token
         self._refresh_exp: int | None = refresh_exp
+        self._refresh_lock = asyncio.Lock()
+        # Only the network round-trip holds a slot, so a token refresh issued
+        # while other requests wait can never starve on it
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._on_token_update = on_token_update
 
-    async def async_get_intercoms(
-        self, on_token_update: Callable[[str, int], None] | None = None
-    ) -> list[IntercomInfo]:
+    async def async_get_intercoms(self) -> list[IntercomInfo]:
         """Authenticate (if needed) and get intercom list."""
-        await self._ensure_access_token(on_token_update)
+        # The public methods are the only place the token is ensured; doing it
+        # outside the try keeps a failed refresh or login from triggering a
+        # second full login in the fallback below
+        await self._ensure_access_token()
         try:
-            data = await self._request("GET", "api/v0/skud/shared/")
+            data = await self._request("GET", _URL_SHARED)
         except UfanetApiAuthError:
-            await self._login(on_token_update)
-            data = await self._request("GET", "api/v0/skud/shared/")
+            await self._login()
+            data = await self._request("GET", _URL_SHARED)
+        if not data:
+            return []
 
         return [
             IntercomInfo(
@@ -114,54 +248,31 @@ class UfanetApiClient:
                 custom_name=item.get("custom_name"),
                 address=item.get("address"),
             )
-            for item in data or []
+            for item in data
         ]
 
-    async def async_open_intercom(
-        self,
-        intercom_id: int,
-        on_token_update: Callable[[str, int], None] | None = None,
-    ) -> bool:
+    async def async_open_intercom(self, intercom_id: int) -> bool:
         """Authenticate (if needed) and open an intercom."""
-        await self._ensure_access_token(on_token_update)
+        url = f"{_URL_SHARED}{intercom_id}/open/"
+        await self._ensure_access_token()
+        # Opening fires the door relay, so a request that may have reached the
+        # server is never repeated
         try:
-            data = await self._request("GET", f"api/v0/skud/shared/{intercom_id}/open/")
+            data = await self._request("GET", url, retry=False)
         except UfanetApiAuthError:
-            await self._login(on_token_update)
-            data = await self._request("GET", f"api/v0/skud/shared/{intercom_id}/open/")
+            await self._login()
+            data = await self._request("GET", url, retry=False)
         return bool(data and data.get("result"))
 
-    async def async_get_cameras(
-        self, on_token_update: Callable[[str, int], None] | None = None
-    ) -> list[CameraInfo]:
+    async def async_get_cameras(self) -> list[CameraInfo]:
         """Get list of cameras with prepared stream info from dom API."""
-        await self._ensure_access_token(on_token_update)
-        data = await self._request("GET", "api/v1/cctv")
-        cameras: list[CameraInfo] = []
-        results = data if isinstance(data, list) else []
-        for item in results or []:
-            servers = item.get("servers", {})
-            domain = servers.get("domain")
-            screenshot_domain = servers.get("screenshot_domain")
-            number = item.get("number")
-            token_l = item.get("token_l")
-            if not (domain and number and token_l):
-                continue
-            cameras.append(
-                CameraInfo(
-                    number=number,
-                    title=item.get("title"),
-                    address=item.get("address"),
-                    domain=domain,
-                    token_l=token_l,
-                    screenshot_domain=screenshot_domain,
-                )
-            )
-        return cameras
+        await self._ensure_access_token()
+        data = await self._request("GET", _URL_CCTV)
+        if not data or not isinstance(data, list):
+            return []
+        return [cam for item in data if (cam := _parse_camera(item)) is not None]
 
-    async def _login(
-        self, on_token_update: Callable[[str, int], None] | None = None
-    ) -> None:
+    async def _login(self) -> None:
         """Full login to obtain access and refresh tokens (requires password)."""
         if not self._password:
             msg = "Refresh token expired. Please reconfigure the integration."
@@ -169,7 +280,7 @@ class UfanetApiClient:
 
         data = await self._request(
             "POST",
-            "api/v1/auth/auth_by_contract/",
+            _URL_LOGIN,
             json={"contract": self._contract, "password": self._password},
             include_token=False,
         )
@@ -181,17 +292,14 @@ class UfanetApiClient:
             msg = "No token in response"
             raise UfanetApiAuthError(msg)
 
-        self._access_token = access
-        self._access_exp = self._extract_exp(access)
+        self._set_access_token(access)
         self._refresh_token = refresh
         self._refresh_exp = refresh_exp
 
-        if on_token_update:
-            await on_token_update(refresh, refresh_exp)
+        if self._on_token_update:
+            await self._on_token_update(refresh, refresh_exp)
 
-    async def _refresh_access_token(
-        self, on_token_update: Callable[[str, int], None] | None = None
-    ) -> None:
+    async def _refresh_access_token(self) -> None:
         """Refresh access (and refresh) token using refresh token."""
         if not self._refresh_token:
             msg = "No refresh token available"
@@ -199,7 +307,7 @@ class UfanetApiClient:
 
         data = await self._request(
             "POST",
-            "api/v1/auth/refresh/",
+            _URL_REFRESH,
             json={"token": self._refresh_token},
             include_token=False,
         )
@@ -215,31 +323,52 @@ class UfanetApiClient:
             msg = "Refresh failed"
             raise UfanetApiAuthError(msg)
 
-        self._access_token = access
-        self._access_exp = self._extract_exp(access)
+        self._set_access_token(access)
         self._refresh_token = refresh
         self._refresh_exp = refresh_exp
 
-        cb = on_token_update or getattr(self, "_token_update_cb", None)
-        if cb:
-            await cb(refresh, refresh_exp)
+        if self._on_token_update:
+            await self._on_token_update(refresh, refresh_exp)
 
-    async def _ensure_access_token(
-        self, on_token_update: Callable[[str, int], None] | None = None
-    ) -> None:
+    def _set_access_token(self, access: str) -> None:
+        """Store a new access token and decode its expiration once."""
+        self._access_token = access
+        self._auth_header = f"JWT {access}"
+        self._access_exp = self._extract_exp(access)
+        # Wall-clock time at which the token counts as expiring (0 = unknown)
+        self._access_trip_wall = (
+            self._access_exp - TOKEN_EXPIRATION_SKEW
+            if self._access_exp is not None
+            else 0.0
+        )
+        self._next_check_mono = 0.0
+
+    async def _ensure_access_token(self) -> None:
         """Ensure a valid access token is available."""
-        if on_token_update:
-            self._token_update_cb = on_token_update
-        if self._access_token and not self._is_expiring(self._access_exp):
+        now = time.monotonic()
+        if now < self._next_check_mono:
+            return
+        valid_for = self._access_trip_wall - time.time()
+        if valid_for > 0:
+            # Trust the token until shortly before it starts expiring
+            self._next_check_mono = now + min(TOKEN_CHECK_INTERVAL, valid_for)
             return
 
+        async with self._refresh_lock:
+            # Another caller may have renewed the token while we were waiting
+            if time.time() < self._access_trip_wall:
+                return
+            await self._renew_access_token()
+
+    async def _renew_access_token(self) -> None:
+        """Obtain a new access token via refresh token or full login."""
         # Try refresh token if present (even if exp unknown)
         refresh_exp_ok = self._refresh_exp is None or not self._is_expiring(
             self._refresh_exp
         )
         if self._refresh_token and refresh_exp_ok:
             try:
-                await self._refresh_access_token(on_token_update)
+                await self._refresh_access_token()
             except UfanetApiAuthError:
                 # Refresh token expired; will try password below if available
                 pass
@@ -248,7 +377,7 @@ class UfanetApiClient:
 
         # If we have a password (initial login or re-login), attempt full login
         if self._password:
-            await self._login(on_token_update)
+            await self._login()
             return
 
         # No refresh token and no password -> require reconfiguration
@@ -258,17 +387,7 @@ class UfanetApiClient:
     @staticmethod
     def _extract_exp(token: str | None) -> int | None:
         """Extract exp from JWT without verification."""
-        if not token:
-            return None
-        try:
-            parts = token.split(".")
-            if len(parts) != JWT_PARTS_COUNT:
-                return None
-            payload_b64 = parts[1] + "=" * (-len(parts[1]) % 4)
-            payload = json.loads(base64.urlsafe_b64decode(payload_b64.encode()))
-            return int(payload.get("exp")) if "exp" in payload else None
-        except (ValueError, KeyError, json.JSONDecodeError):
-            return None
+        return parse_jwt_exp(token)
 
     @staticmethod
     def _is_expiring(
@@ -290,6 +409,89 @@ class UfanetApiClient:
         """Public wrapper for checking whether a token is expiring."""
         return UfanetApiClient._is_expiring(exp, skew_seconds=skew_seconds)
 
+    @staticmethod
+    def _parse_response(status: int, body: bytes) -> Any:
+        """Decode a response: JSON on success, raise with body text on error."""
+        if status >= HTTP_STATUS_BAD_REQUEST:
+            error_msg = f"{status}: {body.decode(errors='replace')}"
+            raise UfanetApiError(error_msg)
+        if not body.strip():
+            return None
+        try:
+            return _json_loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return body.decode(errors="replace")
+
+    async def _send_once(
+        self, method: str, url: str, deadline: float, **kwargs: Any
+    ) -> tuple[int, bytes]:
+        """Send a single request and return its status and raw body."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError
+        timeout = ClientTimeout(
+            total=remaining,
+            connect=CONNECT_TIMEOUT,
+            sock_connect=CONNECT_TIMEOUT,
+        )
+        async with (
+            self._semaphore,
+            self._session.request(method, url, timeout=timeout, **kwargs) as resp,
+        ):
+            return resp.status, await resp.read()
+
+    async def _send(
+        self, method: str, url: str, deadline: float, *, retry: bool, **kwargs: Any
+    ) -> tuple[int, bytes]:
+        """Send a request unless the circuit breaker for its host is open."""
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = _CircuitBreaker()
+        if not breaker.allow():
+            msg = f"{host} is unavailable (circuit open)"
+            raise UfanetApiError(msg)
+
+        try:
+            status, body = await self._send_with_retries(
+                method, url, deadline, retry=retry, **kwargs
+            )
+        except (ClientConnectorError, TimeoutError):
+            breaker.record_failure()
+            raise
+        if status >= HTTP_STATUS_SERVER_ERROR:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return status, body
+
+    async def _send_with_retries(
+        self, method: str, url: str, deadline: float, *, retry: bool, **kwargs: Any
+    ) -> tuple[int, bytes]:
+        """
+        Send a request, retrying transient failures with jittered backoff.
+
+        Without retry, only connection failures are retried: the request never
+        reached the server, so it cannot have taken effect yet.
+        """
+        for attempt in range(RETRY_ATTEMPTS - 1):
+            try:
+                status, body = await self._send_once(method, url, deadline, **kwargs)
+            except ClientConnectorError:
+                pass
+            except TimeoutError:
+                if not retry:
+                    raise
+            else:
+                if not retry or status not in RETRY_STATUSES:
+                    return status, body
+            cap = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2**attempt)
+            delay = random.uniform(0, cap)  # noqa: S311
+            if time.monotonic() + delay >= deadline:
+                break
+            await asyncio.sleep(delay)
+        return await self._send_once(method, url, deadline, **kwargs)
+
     async def _request(  # noqa: PLR0913
         self,
         method: str,
@@ -301,45 +503,57 @@ class UfanetApiClient:
         timeout_seconds: int = 30,
         base_url: str = BASE_URL,
         extra_headers: dict[str, str] | None = None,
+        retry: bool = True,
     ) -> Any:
-        """Perform HTTP request with optional JWT token."""
+        """
+        Perform HTTP request with optional JWT token.
+
+        Callers ensure a valid access token first (see _ensure_access_token);
+        the 401 retry below only covers server-side revocation. Pass
+        retry=False for requests with side effects, so a request that may
+        already have reached the server is never sent twice.
+        """
         headers: dict[str, str] = {}
-        if include_token and self._access_token:
-            headers["Authorization"] = f"JWT {self._access_token}"
+        sent_token = self._access_token
+        if include_token and sent_token:
+            headers["Authorization"] = self._auth_header
         if extra_headers:
             headers.update(extra_headers)
 
-        url = urljoin(base_url, path)
+        if path.startswith(("http://", "https://")):
+            url = path
+        else:
+            url = urljoin(base_url, path)
 
+        deadline = time.monotonic() + timeout_seconds
         try:
-            async with async_timeout.timeout(timeout_seconds):  # noqa: SIM117
-                async with self._session.request(
-                    method, url, json=json, params=params, headers=headers
-                ) as resp:
-                    text = await resp.text()
-                    if resp.status == HTTP_STATUS_UNAUTHORIZED and include_token:
-                        # Attempt refresh once, then retry
+            status, body = await self._send(
+                method,
+                url,
+                deadline,
+                retry=retry,
+                json=json,
+                params=params,
+                headers=headers,
+            )
+            if status == HTTP_STATUS_UNAUTHORIZED and include_token:
+                # Attempt refresh once (unless a concurrent caller already did),
+                # then retry
+                async with self._refresh_lock:
+                    if self._access_token == sent_token:
                         await self._refresh_access_token()
-                        headers["Authorization"] = f"JWT {self._access_token}"
-                        async with self._session.request(
-                            method, url, json=json, params=params, headers=headers
-                        ) as retry_resp:
-                            retry_text = await retry_resp.text()
-                            if retry_resp.status >= HTTP_STATUS_BAD_REQUEST:
-                                error_msg = f"{retry_resp.status}: {retry_text}"
-                                raise UfanetApiError(error_msg)
-                            try:
-                                return await retry_resp.json(content_type=None)
-                            except (ValueError, KeyError):
-                                return retry_text
-                    if resp.status >= HTTP_STATUS_BAD_REQUEST:
-                        error_msg = f"{resp.status}: {text}"
-                        raise UfanetApiError(error_msg)
-                    try:
-                        return await resp.json(content_type=None)
-                    except (ValueError, KeyError):
-                        return text
+                headers["Authorization"] = self._auth_header
+                status, body = await self._send(
+                    method,
+                    url,
+                    deadline,
+                    retry=retry,
+                    json=json,
+                    params=params,
+                    headers=headers,
+                )
         except ClientResponseError as err:
             if err.status == HTTP_STATUS_UNAUTHORIZED:
                 raise UfanetApiAuthError(str(err)) from err
             raise UfanetApiError(str(err)) from err
+        return self._parse_response(status, body)
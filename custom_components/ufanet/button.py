@@ -6,26 +6,35 @@ from typing import TYPE_CHECKING
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 
-from .api import UfanetApiAuthError, UfanetApiClient
-from .const import CONF_CONTRACT, DOMAIN
+from .api import UfanetApiAuthError
+from .const import DOMAIN
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .data import UfanetRuntimeData
+
+# Identical for every door button; the per-intercom identity lives in unique_id
+_OPEN_DESC = ButtonEntityDescription(
+    key="open_intercom",
+    translation_key="open_intercom",
+    icon="mdi:door",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up button entities for all intercoms."""
-    data = hass.data[DOMAIN][entry.entry_id]
-    intercoms = data.get("intercoms", [])
+    data: UfanetRuntimeData = hass.data[DOMAIN][entry.entry_id]
 
-    buttons = [UfanetOpenDoorButton(entry, data, intercom) for intercom in intercoms]
+    buttons = [
+        UfanetOpenDoorButton(entry, data, intercom) for intercom in data.intercoms
+    ]
     async_add_entities(buttons)
 
 
@@ -34,18 +43,16 @@ class UfanetOpenDoorButton(ButtonEntity):
 
     _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry, data: dict, intercom: dict) -> None:
+    def __init__(
+        self, entry: ConfigEntry, data: UfanetRuntimeData, intercom: dict
+    ) -> None:
         """Initialize the button entity."""
         self._entry = entry
-        self._contract = data[CONF_CONTRACT]
+        self._contract = data.contract
         self._intercom_id = intercom["id"]
         self._intercom_name = intercom["name"]
 
-        self.entity_description = ButtonEntityDescription(
-            key=f"open_intercom_{self._intercom_id}",
-            translation_key="open_intercom",
-            icon="mdi:door",
-        )
+        self.entity_description = _OPEN_DESC
 
         self._attr_unique_id = f"{self._contract}_{self._intercom_id}_open"
         self._attr_name = self._intercom_name
@@ -57,32 +64,10 @@ class UfanetOpenDoorButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press to open the intercom."""
-        data = self.hass.data[DOMAIN][self._entry.entry_id]
-        session = async_get_clientsession(self.hass)
-
-        # Create callback to save token updates
-        store = data.get("_store")
-        contract = data.get("_contract")
-
-        async def save_token(token: str, exp: int) -> None:
-            if store and contract:
-                stored_data = await store.async_load() or {}
-                if contract not in stored_data:
-                    stored_data[contract] = {}
-                stored_data[contract]["refresh_token"] = token
-                stored_data[contract]["refresh_exp"] = exp
-                await store.async_save(stored_data)
-
-        client = UfanetApiClient(
-            session,
-            self._contract,
-            refresh_token=data.get("refresh_token"),
-            refresh_exp=data.get("refresh_exp"),
-        )
+        data: UfanetRuntimeData = self.hass.data[DOMAIN][self._entry.entry_id]
+
         try:
-            await client.async_open_intercom(
-                self._intercom_id, on_token_update=save_token
-            )
+            await data.client.async_open_intercom(self._intercom_id)
         except UfanetApiAuthError as err:
             self._entry.async_start_reauth(self.hass)
             msg = "Authentication failed. Please re-authenticate the integration."
@@ -2,51 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-import async_timeout
+from aiohttp import ClientTimeout
 from homeassistant.components.camera import Camera, CameraEntityFeature
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 
-from .api import CameraInfo, UfanetApiAuthError, UfanetApiClient, UfanetApiError
-from .const import CONF_CONTRACT, DOMAIN
+from .api import (
+    TOKEN_EXPIRATION_SKEW,
+    CameraInfo,
+    UfanetApiAuthError,
+    UfanetApiError,
+)
+from .const import DOMAIN
 
 if TYPE_CHECKING:
+    from aiohttp import ClientSession
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import UfanetApiClient
+    from .data import UfanetRuntimeData
+
+# Screenshot fetch timeout; connect and read fail fast on their own
+IMAGE_TIMEOUT = ClientTimeout(total=10, connect=3, sock_read=5)
+
+# Seconds a fetched screenshot is reused for repeated requests
+IMAGE_CACHE_TTL = 0.5
+
+# Screenshot prefetch: start this many seconds before the expected next poll,
+# serve prefetched frames up to this age, and stop for slower poll cadences
+PREFETCH_LEAD = 1.0
+PREFETCH_MAX_AGE = 2.0
+PREFETCH_MAX_INTERVAL = 30.0
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up cameras."""
-    data = hass.data[DOMAIN][entry.entry_id]
-    session = async_get_clientsession(hass)
-
-    # Create callback to save token updates
-    store = data.get("_store")
-    contract = data.get("_contract")
-
-    async def save_token(token: str, exp: int) -> None:
-        if store and contract:
-            stored_data = await store.async_load() or {}
-            if contract not in stored_data:
-                stored_data[contract] = {}
-            stored_data[contract]["refresh_token"] = token
-            stored_data[contract]["refresh_exp"] = exp
-            await store.async_save(stored_data)
-
-    client = UfanetApiClient(
-        session,
-        data[CONF_CONTRACT],
-        refresh_token=data.get("refresh_token"),
-        refresh_exp=data.get("refresh_exp"),
-    )
+    data: UfanetRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    session = data.session
+    contract = data.contract
+    client = data.client
 
     try:
-        cameras = await client.async_get_cameras(on_token_update=save_token)
+        cameras = await client.async_get_cameras()
     except UfanetApiAuthError:
         entry.async_start_reauth(hass)
         cameras = []
@@ -59,8 +64,55 @@ async def async_setup_entry(
         return
 
     # Create camera entity for each camera in the list, sharing a single API client
-    entities = [UfanetCamera(entry, cam, hass, client) for cam in cameras]
-    async_add_entities(entities, update_before_add=True)
+    context = _CameraContext(
+        refresher=_CameraListRefresher(hass, client),
+        session=session,
+        device_info=DeviceInfo(
+            identifiers={(DOMAIN, contract)},
+            name=contract,
+            manufacturer="Ufanet",
+        ),
+    )
+    entities = [UfanetCamera(entry, cam, hass, context) for cam in cameras]
+    async_add_entities(entities, update_before_add=False)
+
+
+class _CameraListRefresher:
+    """Single-flight camera list refresh shared by all cameras of an entry."""
+
+    def __init__(self, hass: HomeAssistant, client: UfanetApiClient) -> None:
+        """Initialize the refresher."""
+        self._hass = hass
+        self._client = client
+        self._task: asyncio.Task[dict[str, CameraInfo]] | None = None
+
+    async def async_refresh(self) -> dict[str, CameraInfo]:
+        """Fetch cameras keyed by number, joining a fetch already in flight."""
+        if self._task is None:
+            self._task = self._hass.async_create_task(self._async_fetch())
+            self._task.add_done_callback(self._clear_task)
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(self._task)
+
+    async def _async_fetch(self) -> dict[str, CameraInfo]:
+        """Fetch the camera list once and index it for all waiting cameras."""
+        return {cam.number: cam for cam in await self._client.async_get_cameras()}
+
+    def _clear_task(self, _task: asyncio.Task[dict[str, CameraInfo]]) -> None:
+        """Allow the next refresh to start a new fetch."""
+        self._task = None
+
+
+@dataclass(slots=True, frozen=True)
+class _CameraContext:
+    """Objects shared by all cameras of an entry."""
+
+    refresher: _CameraListRefresher
+    # Integration-wide keep-alive pool, so screenshot polls reuse warm
+    # connections to the screenshot host
+    session: ClientSession
+    # DeviceInfo is a plain TypedDict, safe to share between entities
+    device_info: DeviceInfo
 
 
 class UfanetCamera(Camera):
@@ -71,50 +123,59 @@ class UfanetCamera(Camera):
         entry: ConfigEntry,
         cam: CameraInfo,
         hass: HomeAssistant,
-        client: UfanetApiClient,
+        context: _CameraContext,
     ) -> None:
         """Initialize the camera entity."""
         super().__init__()
         self._entry = entry
         self._cam = cam
         self._hass = hass
-        self._client = client
-        self._token_exp: int | None = UfanetApiClient.extract_exp(cam.token_l)
+        self._refresher = context.refresher
+        self._session = context.session
+        self._image_cache: tuple[float, bytes] | None = None
+        self._last_image_request: float | None = None
+        self._prefetch_handle: asyncio.TimerHandle | None = None
+        self._prefetch_task: asyncio.Task[tuple[float, bytes | None]] | None = None
+        self._inflight_task: asyncio.Task[tuple[float, bytes | None]] | None = None
+        self._token_refresh_at = 0.0
+        self._set_token_exp(cam.token_exp)
         self._attr_unique_id = f"{entry.entry_id}_{cam.number}"
         self._attr_name = cam.title or cam.address or cam.number
         # Initialize URLs
         self._stream_url = ""
         self._screenshot_url: str | None = None
+        self._build_url_prefixes()
         self._update_urls()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.data.get(CONF_CONTRACT))},
-            name=entry.data.get(CONF_CONTRACT),
-            manufacturer="Ufanet",
+        self._attr_device_info = context.device_info
+
+    def _build_url_prefixes(self) -> None:
+        """Precompute the token-independent parts of the camera URLs."""
+        cam = self._cam
+        self._stream_prefix = f"rtsp://{cam.domain}/{cam.number}?token="
+        self._screenshot_prefix = (
+            f"https://{cam.screenshot_domain}/api/v0/screenshots/"
+            f"{cam.number}~600.jpg?token="
+            if cam.screenshot_domain
+            else None
         )
 
     def _update_urls(self) -> None:
         """Update stream and screenshot URLs based on current camera info."""
-        self._stream_url = (
-            f"rtsp://{self._cam.domain}/{self._cam.number}?token={self._cam.token_l}"
-        )
-        if self._cam.screenshot_domain:
-            self._screenshot_url = (
-                f"https://{self._cam.screenshot_domain}/api/v0/screenshots/"
-                f"{self._cam.number}~600.jpg?token={self._cam.token_l}"
-            )
+        token = self._cam.token_l
+        self._stream_url = self._stream_prefix + token
+        if self._screenshot_prefix:
+            self._screenshot_url = self._screenshot_prefix + token
         else:
             self._screenshot_url = None
 
-    async def _refresh_camera_token_if_needed(self) -> None:
-        """Refresh camera token_l if it is close to expiration."""
-        # If we know exp and it is not expiring soon, do nothing
-        if self._token_exp is not None and not UfanetApiClient.is_expiring(
-            self._token_exp
-        ):
-            return
+    def _set_token_exp(self, exp: int | None) -> None:
+        """Remember when token_l must be refreshed (immediately if exp unknown)."""
+        self._token_refresh_at = exp - TOKEN_EXPIRATION_SKEW if exp is not None else 0.0
 
+    async def _refresh_camera_token(self) -> None:
+        """Fetch a fresh token_l for this camera."""
         try:
-            cameras = await self._client.async_get_cameras()
+            cameras_by_number = await self._refresher.async_refresh()
         except UfanetApiAuthError:
             self._entry.async_start_reauth(self._hass)
             return
@@ -122,12 +183,16 @@ class UfanetCamera(Camera):
             # If refresh fails, keep using existing URLs
             return
 
-        for cam in cameras:
-            if cam.number == self._cam.number:
-                self._cam = cam
-                self._token_exp = UfanetApiClient.extract_exp(cam.token_l)
-                self._update_urls()
-                break
+        if cam := cameras_by_number.get(self._cam.number):
+            servers_changed = (
+                cam.domain != self._cam.domain
+                or cam.screenshot_domain != self._cam.screenshot_domain
+            )
+            self._cam = cam
+            if servers_changed:
+                self._build_url_prefixes()
+            self._set_token_exp(cam.token_exp)
+            self._update_urls()
 
     @property
     def unique_id(self) -> str:
@@ -151,25 +216,137 @@ class UfanetCamera(Camera):
 
     async def stream_source(self) -> str | None:
         """Return the stream source."""
-        await self._refresh_camera_token_if_needed()
+        if time.time() >= self._token_refresh_at:
+            await self._refresh_camera_token()
         return self._stream_url
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop any pending screenshot prefetch."""
+        if self._prefetch_handle:
+            self._prefetch_handle.cancel()
+            self._prefetch_handle = None
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        if self._inflight_task:
+            self._inflight_task.cancel()
+
     async def async_camera_image(
         self,
         width: int | None = None,  # noqa: ARG002
         height: int | None = None,  # noqa: ARG002
     ) -> bytes | None:
         """Return a still image from the camera."""
-        await self._refresh_camera_token_if_needed()
+        # Serve bursts of requests (cards, notifications, automations) from the
+        # last screenshot; upstream regenerates it about once per second
+        loop = self._hass.loop
+        now = loop.time()
+        if (cached := self._image_cache) and now - cached[0] < IMAGE_CACHE_TTL:
+            return cached[1]
+
+        # Requests racing a download in flight belong to the same poll: share
+        # its result and leave the cadence alone
+        if (inflight := self._inflight_task) is not None:
+            _, image = await self._await_image(inflight)
+            return image
+
+        # Learn the polling cadence so the next frame can be fetched ahead of it
+        last, self._last_image_request = self._last_image_request, now
+        interval = now - last if last is not None else None
+        if interval is not None and interval > PREFETCH_MAX_INTERVAL:
+            interval = None
 
-        if not self._screenshot_url:
+        image = await self._take_prefetched_image()
+        if image is None:
+            if time.time() >= self._token_refresh_at:
+                await self._refresh_camera_token()
+            if not self._screenshot_url:
+                return None
+            task = self._hass.async_create_background_task(
+                self._prefetch_image(), f"{DOMAIN} screenshot {self._cam.number}"
+            )
+            self._track_inflight(task)
+            _, image = await self._await_image(task)
+        if image is not None:
+            self._image_cache = (loop.time(), image)
+
+        self._schedule_prefetch(now, interval)
+        return image
+
+    async def _take_prefetched_image(self) -> bytes | None:
+        """Return the prefetched screenshot if one is fresh or in flight."""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is None or task.cancelled():
             return None
-        session = async_get_clientsession(self._hass)
+        if not task.done():
+            self._track_inflight(task)
+        fetched_at, image = await self._await_image(task)
+        if self._hass.loop.time() - fetched_at > PREFETCH_MAX_AGE:
+            return None
+        return image
+
+    def _track_inflight(self, task: asyncio.Task[tuple[float, bytes | None]]) -> None:
+        """Let concurrent requests join a download until it finishes."""
+        self._inflight_task = task
+        task.add_done_callback(self._clear_inflight)
+
+    def _clear_inflight(self, task: asyncio.Task[tuple[float, bytes | None]]) -> None:
+        """Forget a finished download so the next poll starts a new one."""
+        if self._inflight_task is task:
+            self._inflight_task = None
+
+    async def _await_image(
+        self, task: asyncio.Task[tuple[float, bytes | None]]
+    ) -> tuple[float, bytes | None]:
+        """Wait for a screenshot download without cancelling it."""
+        try:
+            # Shield so a closed preview does not abort the download mid-read,
+            # which would discard the keep-alive connection
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Hand the download to the next request once the caller is gone
+            if not task.done() and self._prefetch_task is None:
+                self._prefetch_task = task
+            raise
+
+    def _schedule_prefetch(self, arrived: float, interval: float | None) -> None:
+        """Prefetch the next screenshot shortly before the expected poll."""
+        if self._prefetch_handle:
+            self._prefetch_handle.cancel()
+            self._prefetch_handle = None
+        # Only while HA keeps polling: every prefetch is armed by a served
+        # request, so at most one extra fetch happens after polling stops
+        if interval is None or interval <= PREFETCH_LEAD:
+            return
+        # Count from this request's arrival, not from when it was served, so
+        # the time spent downloading does not eat into the lead
+        self._prefetch_handle = self._hass.loop.call_at(
+            arrived + interval - PREFETCH_LEAD, self._start_prefetch
+        )
+
+    def _start_prefetch(self) -> None:
+        """Start the background screenshot download."""
+        self._prefetch_handle = None
+        # Leave expiring tokens to the request path, which refreshes them
+        if not self._screenshot_url or time.time() >= self._token_refresh_at:
+            return
+        self._prefetch_task = self._hass.async_create_background_task(
+            self._prefetch_image(), f"{DOMAIN} prefetch {self._cam.number}"
+        )
+
+    async def _prefetch_image(self) -> tuple[float, bytes | None]:
+        """Download a screenshot and record when it arrived."""
+        image = await self._fetch_image()
+        return self._hass.loop.time(), image
+
+    async def _fetch_image(self) -> bytes | None:
+        """Download the current screenshot."""
         try:
-            async with async_timeout.timeout(10):  # noqa: SIM117
-                async with session.get(self._screenshot_url) as resp:
-                    if resp.status == 200:  # noqa: PLR2004
-                        return await resp.read()
-                    return None
+            async with self._session.get(
+                self._screenshot_url, timeout=IMAGE_TIMEOUT
+            ) as resp:
+                if resp.status == 200:  # noqa: PLR2004
+                    return await resp.read()
+                return None
         except Exception:  # noqa: BLE001
             return None
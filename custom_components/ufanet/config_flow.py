@@ -2,21 +2,113 @@
 
 from __future__ import annotations
 
+import functools
+import re
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.storage import Store
 
+from . import async_get_token_store
 from .api import UfanetApiAuthError, UfanetApiClient, UfanetApiError
 from .const import CONF_CONTRACT, CONF_PASSWORD, DOMAIN
 
 if TYPE_CHECKING:
     from homeassistant.data_entry_flow import FlowResult
 
-STORAGE_KEY = f"{DOMAIN}_credentials"
-STORAGE_VERSION = 1
+# Lowercased auth exception class names not caught by the "unauthorized" check
+_AUTH_EXC_NAMES = frozenset({"authenticationerror"})
+
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_CONTRACT): str,
+        vol.Required(CONF_PASSWORD): str,
+    }
+)
+
+_REAUTH_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PASSWORD): str,
+    }
+)
+
+# Auth hints in the message of timeout/unknown errors
+_AUTH_KEYWORDS: tuple[str, ...] = (
+    "невозможно войти",
+    "учетными данными",
+    "неверный",
+    "неправильный",
+    "invalid",
+    "auth",
+    "login",
+    "password",
+    "unauthorized",
+    "forbidden",
+    "401",
+    "403",
+    "decoding signature",
+    "error decoding",
+)
+
+# Auth hints in the message of any other error; timeouts count as auth here
+_OTHER_AUTH_KEYWORDS: tuple[str, ...] = (
+    "auth",
+    "login",
+    "password",
+    "unauthorized",
+    "forbidden",
+    "401",
+    "403",
+    "timeout",
+    "невозможно войти",
+    "учетными данными",
+    "decoding signature",
+    "error decoding",
+)
+
+_AUTH_MESSAGE_RE = re.compile("|".join(map(re.escape, _AUTH_KEYWORDS)), re.IGNORECASE)
+_OTHER_AUTH_MESSAGE_RE = re.compile(
+    "|".join(map(re.escape, _OTHER_AUTH_KEYWORDS)), re.IGNORECASE
+)
+
+
+def _extract_error_message(err: Exception) -> str:
+    """Return the most descriptive message carried by an exception."""
+    first_arg = err.args[0] if err.args else None
+    if isinstance(first_arg, dict):
+        # API error payloads, e.g. {'non_field_errors': [...]} or {'detail': ...}
+        if non_field_errors := first_arg.get("non_field_errors"):
+            return " ".join(str(e) for e in non_field_errors)
+        if "detail" in first_arg:
+            return str(first_arg["detail"])
+        return str(first_arg)
+    if err.args:
+        return str(first_arg)
+    return str(err)
+
+
+def _is_auth_error(error_msg: str, exception_name: str) -> bool:
+    """Classify an error message and lowercased exception name as auth failure."""
+    if "unauthorized" in exception_name or exception_name in _AUTH_EXC_NAMES:
+        return True
+    # Timeout/unknown errors only count as auth when the message says so
+    if "timeout" in exception_name or "unknown" in exception_name:
+        return _AUTH_MESSAGE_RE.search(error_msg) is not None
+    return _OTHER_AUTH_MESSAGE_RE.search(error_msg) is not None
+
+
+def _classify_exception(err: Exception) -> str:
+    """Return the form error key for an unexpected exception."""
+    # Genuine auth failures arrive as UfanetApiAuthError and are handled by the
+    # caller; anything else is classified by its name and message
+    return _classify(_extract_error_message(err), type(err).__name__.lower())
+
+
+@functools.lru_cache(maxsize=128)
+def _classify(error_msg: str, exception_name: str) -> str:
+    """Return the form error key for a message, cached for repeated failures."""
+    return "auth" if _is_auth_error(error_msg, exception_name) else "unknown"
 
 
 class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -24,7 +116,7 @@ class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
-    async def async_step_user(  # noqa: PLR0912, PLR0915
+    async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step: ask for credentials and validate them."""
@@ -37,41 +129,31 @@ class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(contract)
             self._abort_if_unique_id_configured()
 
-            session = async_get_clientsession(self.hass)
-            client = UfanetApiClient(session, contract, password=password)
-
-            # Store for saving token
-            store = Store(self.hass, STORAGE_VERSION, STORAGE_KEY)
-            stored_data = await store.async_load() or {}
-            refresh_token = None
-            token_exp = None
-
-            async def save_token(token: str, exp: int) -> None:
-                nonlocal refresh_token, token_exp
-                refresh_token = token
-                token_exp = exp
-                if contract not in stored_data:
-                    stored_data[contract] = {}
-                stored_data[contract]["refresh_token"] = token
-                stored_data[contract]["refresh_exp"] = exp
-                await store.async_save(stored_data)
+            token_store = await async_get_token_store(self.hass, contract)
+            client = UfanetApiClient(
+                async_get_clientsession(self.hass),
+                contract,
+                password=password,
+                on_token_update=token_store.async_save_token,
+            )
 
             try:
-                intercoms = await client.async_get_intercoms(on_token_update=save_token)
+                intercoms = await client.async_get_intercoms()
 
                 if not intercoms:
                     errors["base"] = "no_intercoms"
                 else:
                     # Save all intercoms as a list
-                    intercoms_data = []
-                    for intercom in intercoms:
-                        name = (
-                            intercom.role_name
+                    intercoms_data = [
+                        {
+                            "id": intercom.id,
+                            "name": intercom.role_name
                             or intercom.string_view
                             or intercom.custom_name
-                            or f"Intercom {intercom.id}"
-                        )
-                        intercoms_data.append({"id": intercom.id, "name": name})
+                            or f"Intercom {intercom.id}",
+                        }
+                        for intercom in intercoms
+                    ]
 
                     # Create entry with contract and intercoms
                     # (no password/token in entry.data)
@@ -85,92 +167,11 @@ class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except UfanetApiError:  # other API errors
                 errors["base"] = "unknown"
             except Exception as err:  # noqa: BLE001  # pragma: no cover - bubble to UI
-                # Extract error message - could be dict, list, or string
-                error_msg = str(err)
-                first_arg = err.args[0] if err.args else None
-                if isinstance(first_arg, dict):
-                    # Try to extract message from dict
-                    # (e.g., {'non_field_errors': [...]})
-                    error_dict = first_arg
-                    if "non_field_errors" in error_dict:
-                        error_list = error_dict["non_field_errors"]
-                        if error_list:
-                            error_msg = " ".join(str(e) for e in error_list)
-                    else:
-                        error_msg = str(error_dict)
-                elif err.args:
-                    error_msg = str(err.args[0])
-
-                error_msg_lower = error_msg.lower()
-
-                # Check exception type name
-                exception_name = type(err).__name__.lower()
-
-                # Explicit auth errors
-                if "unauthorized" in exception_name:
-                    errors["base"] = "auth"
-                # Timeout/unknown errors - check if message indicates auth failure
-                elif "timeout" in exception_name or "unknown" in exception_name:
-                    auth_keywords = [
-                        "невозможно войти",
-                        "учетными данными",
-                        "неверный",
-                        "неправильный",
-                        "invalid",
-                        "auth",
-                        "login",
-                        "password",
-                        "unauthorized",
-                        "forbidden",
-                        "401",
-                        "403",
-                        "decoding signature",
-                        "error decoding",
-                    ]
-                    if any(keyword in error_msg_lower for keyword in auth_keywords):
-                        errors["base"] = "auth"
-                    else:
-                        errors["base"] = "unknown"
-                # Other exceptions - check message for auth-related keywords
-                else:
-                    auth_keywords = [
-                        "auth",
-                        "login",
-                        "password",
-                        "unauthorized",
-                        "forbidden",
-                        "401",
-                        "403",
-                        "timeout",
-                        "невозможно войти",
-                        "учетными данными",
-                        "decoding signature",
-                        "error decoding",
-                    ]
-                    # Also check if error dict contains 'detail'
-                    # with auth-related message
-                    first_arg = err.args[0] if err.args else None
-                    if isinstance(first_arg, dict):
-                        error_dict = first_arg
-                        if "detail" in error_dict:
-                            detail_msg = str(error_dict["detail"]).lower()
-                            if any(keyword in detail_msg for keyword in auth_keywords):
-                                errors["base"] = "auth"
-                            else:
-                                errors["base"] = "unknown"
-                    elif any(keyword in error_msg_lower for keyword in auth_keywords):
-                        errors["base"] = "auth"
-                    else:
-                        errors["base"] = "unknown"
+                errors["base"] = _classify_exception(err)
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_CONTRACT): str,
-                    vol.Required(CONF_PASSWORD): str,
-                }
-            ),
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -189,21 +190,16 @@ class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             contract = self._reauth_contract
             password = user_input[CONF_PASSWORD]
 
-            session = async_get_clientsession(self.hass)
-            client = UfanetApiClient(session, contract, password=password)
-
-            store = Store(self.hass, STORAGE_VERSION, STORAGE_KEY)
-            stored_data = await store.async_load() or {}
-
-            async def save_token(token: str, exp: int) -> None:
-                if contract not in stored_data:
-                    stored_data[contract] = {}
-                stored_data[contract]["refresh_token"] = token
-                stored_data[contract]["refresh_exp"] = exp
-                await store.async_save(stored_data)
+            token_store = await async_get_token_store(self.hass, contract)
+            client = UfanetApiClient(
+                async_get_clientsession(self.hass),
+                contract,
+                password=password,
+                on_token_update=token_store.async_save_token,
+            )
 
             try:
-                await client.async_get_intercoms(on_token_update=save_token)
+                await client.async_get_intercoms()
             except UfanetApiAuthError:
                 errors["base"] = "auth"
             except UfanetApiError:
@@ -219,11 +215,7 @@ class UfanetIntercomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="reauth_confirm",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_PASSWORD): str,
-                }
-            ),
+            data_schema=_REAUTH_SCHEMA,
             description_placeholders={"contract": self._reauth_contract},
             errors=errors,
         )
@@ -0,0 +1,21 @@
+"""Runtime data for the Ufanet Intercom integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from .api import UfanetApiClient
+
+
+@dataclass(slots=True)
+class UfanetRuntimeData:
+    """Per-entry data shared with the platforms."""
+
+    contract: str
+    intercoms: list[dict[str, Any]]
+    client: UfanetApiClient
+    session: ClientSession